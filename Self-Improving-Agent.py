@@ -1,20 +1,26 @@
 
-import google.generativeai as genai
 import json
 import time
 import re
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Iterator, Optional, Set
 from datetime import datetime
 import traceback
-from dotenv import load_dotenv
 import os
-load_dotenv()
 
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+def get_api_key() -> Optional[str]:
+    """Load .env on first use and return GOOGLE_API_KEY"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("GOOGLE_API_KEY")
+
 
 class SelfImprovingAgent:
     def __init__(self, api_key: str):
         """Initialize the self-improving agent with Gemini API"""
+        # Imported here so that loading this module stays cheap for short-lived workers
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
 
@@ -33,8 +39,21 @@ class SelfImprovingAgent:
             'error_handling': 0.5
         }
 
+        # Running totals, so reports stay accurate when memory lists are trimmed
+        self.stats = {
+            'successes': 0,
+            'failures': 0,
+            'evaluated': 0,
+            'quality_total': 0.0,
+            'time_total': 0.0,
+            'patterns_learned': 0,
+            'code_improvements': 0
+        }
+
         self.iteration_count = 0
         self.improvement_history = []
+        # Guards counters and memory when problems are solved from worker threads
+        self._lock = threading.Lock()
 
     def analyze_task(self, task: str) -> Dict[str, Any]:
         """Analyze a given task and determine approach"""
@@ -71,8 +90,10 @@ class SelfImprovingAgent:
 
     def solve_problem(self, problem: str) -> Dict[str, Any]:
         """Attempt to solve a problem using current capabilities"""
-        self.iteration_count += 1
-        print(f"\n=== Iteration {self.iteration_count} ===")
+        with self._lock:
+            self.iteration_count += 1
+            iteration = self.iteration_count
+        print(f"\n=== Iteration {iteration} ===")
         print(f"Problem: {problem}")
 
         task_analysis = self.analyze_task(problem)
@@ -102,25 +123,34 @@ class SelfImprovingAgent:
                 'problem': problem,
                 'solution': response.text,
                 'solve_time': solve_time,
-                'iteration': self.iteration_count,
+                'iteration': iteration,
                 'task_analysis': task_analysis
             }
 
             quality_score = self.evaluate_solution(solution)
             solution['quality_score'] = quality_score
 
-            self.memory['performance_metrics'].append({
-                'iteration': self.iteration_count,
-                'quality': quality_score,
-                'time': solve_time,
-                'complexity': task_analysis.get('complexity', 5)
-            })
+            with self._lock:
+                self.memory['performance_metrics'].append({
+                    'iteration': iteration,
+                    'quality': quality_score,
+                    'time': solve_time,
+                    'complexity': task_analysis.get('complexity', 5)
+                })
+                self.stats['evaluated'] += 1
+                self.stats['quality_total'] += quality_score
+                self.stats['time_total'] += solve_time
+
+                if quality_score > 0.7:
+                    self.memory['successful_strategies'].append(solution)
+                    self.stats['successes'] += 1
+                else:
+                    self.memory['failed_attempts'].append(solution)
+                    self.stats['failures'] += 1
 
             if quality_score > 0.7:
-                self.memory['successful_strategies'].append(solution)
                 print(f"✅ Solution Quality: {quality_score:.2f} (Success)")
             else:
-                self.memory['failed_attempts'].append(solution)
                 print(f"❌ Solution Quality: {quality_score:.2f} (Needs Improvement)")
 
             return solution
@@ -131,11 +161,13 @@ class SelfImprovingAgent:
                 'problem': problem,
                 'solution': f"Error occurred: {str(e)}",
                 'solve_time': 0,
-                'iteration': self.iteration_count,
+                'iteration': iteration,
                 'quality_score': 0.0,
                 'error': str(e)
             }
-            self.memory['failed_attempts'].append(error_solution)
+            with self._lock:
+                self.memory['failed_attempts'].append(error_solution)
+                self.stats['failures'] += 1
             return error_solution
 
     def evaluate_solution(self, solution: Dict[str, Any]) -> float:
@@ -170,15 +202,15 @@ class SelfImprovingAgent:
         """Analyze past performance and improve capabilities"""
         print("\n🧠 Learning from experience...")
 
-        if len(self.memory['performance_metrics']) < 2:
+        if self.stats['evaluated'] < 2:
             return
 
         learning_prompt = f"""
         Analyze my performance and suggest improvements:
 
         Recent Performance Metrics: {self.memory['performance_metrics'][-5:]}
-        Successful Strategies: {len(self.memory['successful_strategies'])}
-        Failed Attempts: {len(self.memory['failed_attempts'])}
+        Successful Strategies: {self.stats['successes']}
+        Failed Attempts: {self.stats['failures']}
 
         Current Capabilities: {self.capabilities}
 
@@ -201,9 +233,10 @@ class SelfImprovingAgent:
 
                 if 'new_capabilities' in learning_results:
                     old_capabilities = self.capabilities.copy()
-                    for capability, score in learning_results['new_capabilities'].items():
-                        if capability in self.capabilities:
-                            self.capabilities[capability] = min(max(float(score), 0.0), 1.0)
+                    with self._lock:
+                        for capability, score in learning_results['new_capabilities'].items():
+                            if capability in self.capabilities:
+                                self.capabilities[capability] = min(max(float(score), 0.0), 1.0)
 
                     print(f"📈 Capability Updates:")
                     for cap, (old, new) in zip(self.capabilities.keys(),
@@ -212,7 +245,9 @@ class SelfImprovingAgent:
                         print(f"  {cap}: {old:.2f} → {new:.2f} ({change:+.2f})")
 
                 if 'patterns' in learning_results:
-                    self.memory['learned_patterns'].extend(learning_results['patterns'])
+                    with self._lock:
+                        self.memory['learned_patterns'].extend(learning_results['patterns'])
+                        self.stats['patterns_learned'] += len(learning_results['patterns'])
 
                 self.improvement_history.append({
                     'iteration': self.iteration_count,
@@ -256,7 +291,9 @@ class SelfImprovingAgent:
                 'iteration': self.iteration_count
             }
 
-            self.memory['code_improvements'].append(improved_code)
+            with self._lock:
+                self.memory['code_improvements'].append(improved_code)
+                self.stats['code_improvements'] += 1
             return response.text
 
         except Exception as e:
@@ -309,14 +346,91 @@ class SelfImprovingAgent:
 
             time.sleep(2)
 
+    def trim_memory(self, window: int):
+        """Keep only the most recent `window` (at least 1) entries of each memory list
+
+        Reports and learning prompts use `self.stats` for totals, so trimming
+        only drops old entries that no longer feed into prompts.
+        """
+        with self._lock:
+            for key, entries in self.memory.items():
+                if len(entries) > window:
+                    del entries[:-window]
+            if len(self.improvement_history) > window:
+                del self.improvement_history[:-window]
+
+    def run_batch(self, problems_path: str, output_path: str, concurrency: int = 4,
+                  resume: bool = True, learn_every: int = 0, memory_window: int = 50) -> int:
+        """Solve problems streamed from a JSONL/CSV file, appending each result to a JSONL file
+
+        At most `concurrency` problems are in flight at once and results are written
+        as soon as they finish, so memory use does not grow with the dataset size.
+        With `resume`, IDs already present in the output file are skipped, except
+        those whose record holds an error, which are retried.
+
+        Results are recorded on the calling thread. When `learn_every` is set,
+        learning also runs there, so no new problems are submitted until it
+        finishes (problems already in flight keep running).
+        Returns the number of problems solved in this run.
+        """
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+        if memory_window < 1:
+            raise ValueError(f"memory_window must be at least 1, got {memory_window}")
+
+        done_ids = set()
+        if resume:
+            truncate_partial_line(output_path)
+            done_ids = load_completed_ids(output_path)
+        if done_ids:
+            print(f"⏩ Resuming: skipping {len(done_ids)} already completed problems")
+
+        concurrency = max(1, concurrency)
+        completed = 0
+
+        print(f"🚀 Starting batch run from {problems_path} (concurrency={concurrency})")
+
+        with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+            def record(future, problem_id):
+                nonlocal completed
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'solution': f"Error occurred: {str(e)}", 'quality_score': 0.0, 'error': str(e)}
+                out.write(json.dumps({'id': problem_id, **result}, default=str) + '\n')
+                out.flush()
+                completed += 1
+                if learn_every and completed % learn_every == 0:
+                    self.learn_from_experience()
+                self.trim_memory(memory_window)
+
+            pending = {}
+            try:
+                for problem_id, problem in iter_problems(problems_path):
+                    if problem_id in done_ids:
+                        continue
+                    if len(pending) >= concurrency:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future, pending.pop(future))
+                    pending[executor.submit(self.solve_problem, problem)] = problem_id
+            finally:
+                # Write whatever is still in flight, even if reading the input failed
+                for future in list(pending):
+                    record(future, pending.pop(future))
+
+        print(f"\n📦 Batch complete: {completed} new results written to {output_path}")
+        return completed
+
     def get_performance_report(self) -> str:
         """Generate a comprehensive performance report"""
-        if not self.memory['performance_metrics']:
+        if not self.stats['evaluated']:
             return "No performance data available yet."
 
-        metrics = self.memory['performance_metrics']
-        avg_quality = sum(m['quality'] for m in metrics) / len(metrics)
-        avg_time = sum(m['time'] for m in metrics) / len(metrics)
+        avg_quality = self.stats['quality_total'] / self.stats['evaluated']
+        avg_time = self.stats['time_total'] / self.stats['evaluated']
 
         report = f"""
         📈 AGENT PERFORMANCE REPORT
@@ -326,24 +440,134 @@ class SelfImprovingAgent:
         Average Solution Quality: {avg_quality:.3f}
         Average Solve Time: {avg_time:.2f}s
 
-        Successful Solutions: {len(self.memory['successful_strategies'])}
-        Failed Attempts: {len(self.memory['failed_attempts'])}
-        Success Rate: {len(self.memory['successful_strategies']) / max(1, self.iteration_count) * 100:.1f}%
+        Successful Solutions: {self.stats['successes']}
+        Failed Attempts: {self.stats['failures']}
+        Success Rate: {self.stats['successes'] / max(1, self.iteration_count) * 100:.1f}%
 
         Current Capabilities:
         {json.dumps(self.capabilities, indent=2)}
 
-        Patterns Learned: {len(self.memory['learned_patterns'])}
-        Code Improvements: {len(self.memory['code_improvements'])}
+        Patterns Learned: {self.stats['patterns_learned']}
+        Code Improvements: {self.stats['code_improvements']}
         """
 
         return report
 
 
+def iter_problems(path: str) -> Iterator[tuple]:
+    """Lazily yield (id, problem) pairs from a JSONL or CSV file
+
+    JSONL lines may be objects with 'id' and 'problem' keys or bare strings;
+    CSV files need a 'problem' column and may have an 'id' column.
+    Rows without an id get 'line-<n>' (JSONL) or 'row-<n>' (CSV); ids should be
+    unique across the file, since resume skips every row whose id is done.
+    Malformed rows are reported and skipped.
+    """
+    import csv
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            reader = csv.DictReader(f)
+            if 'problem' not in (reader.fieldnames or []):
+                raise ValueError(f"{path} has no 'problem' column")
+            for index, row in enumerate(reader, start=1):
+                if not row.get('problem'):
+                    print(f"⚠️  Skipping CSV row {index}: missing 'problem'")
+                    continue
+                yield str(row.get('id') or f"row-{index}"), row['problem']
+        else:
+            for index, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as e:
+                    print(f"⚠️  Skipping line {index}: invalid JSON ({e})")
+                    continue
+                if isinstance(item, str):
+                    yield f"line-{index}", item
+                elif isinstance(item, dict) and isinstance(item.get('problem'), str):
+                    problem_id = item.get('id')
+                    yield (f"line-{index}" if problem_id is None else str(problem_id)), item['problem']
+                else:
+                    print(f"⚠️  Skipping line {index}: expected a string or an object with 'problem'")
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """Return the IDs already written to a results JSONL file
+
+    Records with an 'error' key are left out so that transient API failures
+    are retried on resume.
+    """
+    done_ids = set()
+    if not os.path.exists(output_path):
+        return done_ids
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if 'error' not in record:
+                    done_ids.add(str(record['id']))
+            except (ValueError, KeyError, TypeError):
+                # Skip a partially written trailing line from an interrupted run
+                continue
+    return done_ids
+
+
+def truncate_partial_line(output_path: str, chunk_size: int = 4096):
+    """Cut a results file back to its last newline, dropping a half-written record"""
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+def run_batch(problems_path: str, output_path: str, concurrency: int = 4, resume: bool = True,
+              learn_every: int = 0, memory_window: int = 50, api_key: Optional[str] = None) -> int:
+    """Create an agent and run it over a problem file in batch mode"""
+    agent = SelfImprovingAgent(api_key or get_api_key())
+    return agent.run_batch(problems_path, output_path, concurrency=concurrency, resume=resume,
+                           learn_every=learn_every, memory_window=memory_window)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> 'argparse.Namespace':
+    """Parse command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Self-improving agent powered by Gemini")
+    parser.add_argument('--input', help="JSONL or CSV file of problems to solve in batch mode")
+    parser.add_argument('--output', default='results.jsonl', help="JSONL file results are appended to")
+    parser.add_argument('--concurrency', type=int, default=4, help="Maximum problems solved at once")
+    parser.add_argument('--learn-every', type=int, default=0,
+                        help="Learn from experience after this many results (0 disables); "
+                             "new submissions pause while learning")
+    parser.add_argument('--memory-window', type=int, default=50,
+                        help="Entries kept in each memory list during batch runs")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="Overwrite the output file instead of skipping completed IDs")
+    parser.add_argument('--setup', action='store_true', help="Print setup instructions before running")
+    args = parser.parse_args(argv)
+    if args.memory_window < 1:
+        parser.error("--memory-window must be at least 1")
+    return args
+
+
 def main():
     """Main function to demonstrate the self-improving agent"""
 
-    API_KEY = GOOGLE_API_KEY
+    API_KEY = get_api_key()
 
     if API_KEY == "Use Your GEMINI KEY Here":
         print("⚠️  Please set your Gemini API key in the API_KEY variable")
@@ -409,6 +633,12 @@ def setup_instructions():
     print(instructions)
 
 if __name__ == "__main__":
-    setup_instructions()
-    print("\n" + "="*60)
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.setup:
+        setup_instructions()
+        print("\n" + "="*60)
+    if args.input:
+        run_batch(args.input, args.output, concurrency=args.concurrency, resume=not args.no_resume,
+                  learn_every=args.learn_every, memory_window=args.memory_window)
+    else:
+        main()
\ No newline at end of file
@@ -1 +1,8 @@
-from . import agent
+import importlib
+
+
+def __getattr__(name):
+    # Build the agents only when `agent` is first accessed (e.g. by the ADK loader)
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
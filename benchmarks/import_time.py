@@ -0,0 +1,105 @@
+"""Report the cold-start import cost of each agent entry point using `python -X importtime`
+
+Each entry point's cost is the sum of its top-level imports that do not also
+appear in a baseline run performing the same loader imports, so interpreter
+startup and the harness's own imports are not counted.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT_BASELINE = "import importlib.util as u"
+PACKAGE_BASELINE = "pass"
+
+
+def script_loader(filename: str) -> str:
+    """Code that executes a top-level script as a module without running its __main__ block"""
+    return (
+        f"{SCRIPT_BASELINE}; "
+        f"s = u.spec_from_file_location('entry_point', {os.path.join(ROOT, filename)!r}); "
+        "s.loader.exec_module(u.module_from_spec(s))"
+    )
+
+
+# name -> (code to time, baseline code with the same loader imports)
+ENTRY_POINTS = {
+    'Self-Improving-Agent.py': (script_loader('Self-Improving-Agent.py'), SCRIPT_BASELINE),
+    'Self-Improving-Agent_AI.py': (script_loader('Self-Improving-Agent_AI.py'), SCRIPT_BASELINE),
+    'Self-Improving-Multi-Agent': (
+        # __import__ goes through the import statement machinery that -X importtime reports on
+        "__import__('Self-Improving-Multi-Agent')",
+        PACKAGE_BASELINE,
+    ),
+    'Self-Improving-Multi-Agent root_agent': (
+        "__import__('Self-Improving-Multi-Agent').agent.root_agent",
+        PACKAGE_BASELINE,
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """Return total microseconds and the (cumulative_us, module) pairs of top-level imports"""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        if not name.startswith(' ' * 2):
+            top_level.append((int(cumulative), name.strip()))
+    return sum(us for us, _ in top_level), top_level
+
+
+def measure(code: str) -> Dict[str, object]:
+    """Run `code` in a fresh interpreter and collect its import timings"""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    total_us, top_level = parse_importtime(proc.stderr)
+    error = None
+    if proc.returncode:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        error = lines[-1] if lines else f"exited with status {proc.returncode}"
+    return {'wall': wall, 'total_us': total_us, 'top_level': top_level, 'error': error}
+
+
+def best_of(code: str, repeat: int) -> Dict[str, object]:
+    """Return the fastest of `repeat` runs of `code`"""
+    return min((measure(code) for _ in range(max(1, repeat))), key=lambda r: r['wall'])
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per entry point (best is reported)")
+    parser.add_argument('--top', type=int, default=5, help="Slowest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    print(f"{'entry point':<40} {'imports (ms)':>12} {'wall (ms)':>10}")
+    print('-' * 64)
+    for name, (code, baseline_code) in ENTRY_POINTS.items():
+        if baseline_code not in baselines:
+            baselines[baseline_code] = best_of(baseline_code, args.repeat)
+        baseline = baselines[baseline_code]
+        best = best_of(code, args.repeat)
+
+        baseline_modules = {module for _, module in baseline['top_level']}
+        own_imports = [(us, module) for us, module in best['top_level'] if module not in baseline_modules]
+
+        import_ms = sum(us for us, _ in own_imports) / 1000
+        wall_ms = max(0.0, best['wall'] - baseline['wall']) * 1000
+        print(f"{name:<40} {import_ms:>12.1f} {wall_ms:>10.1f}")
+        if best['error']:
+            print(f"    failed: {best['error']}")
+        for us, module in sorted(own_imports, reverse=True)[:args.top]:
+            print(f"    {us / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
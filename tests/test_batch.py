@@ -0,0 +1,172 @@
+import importlib.util
+import json
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def sia():
+    spec = importlib.util.spec_from_file_location(
+        'self_improving_agent', os.path.join(ROOT, 'Self-Improving-Agent.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Stand-in for google.generativeai whose model always scores 0.8"""
+    class Response:
+        text = '0.8'
+
+    class GenerativeModel:
+        fail = False
+
+        def __init__(self, name):
+            pass
+
+        def generate_content(self, prompt):
+            if GenerativeModel.fail:
+                raise RuntimeError("quota exceeded")
+            return Response()
+
+    genai = types.ModuleType('google.generativeai')
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = GenerativeModel
+    google = types.ModuleType('google')
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, 'google', google)
+    monkeypatch.setitem(sys.modules, 'google.generativeai', genai)
+    return genai
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def read_results(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_iter_problems_jsonl(sia, tmp_path):
+    path = write(tmp_path / 'p.jsonl',
+                 '{"id": "a", "problem": "x"}\n'
+                 '"bare"\n'
+                 '\n'
+                 '{"problem": "no id"}\n'
+                 '{"id": 7, "problem": "numeric id"}\n'
+                 '{"id": null, "problem": "null id"}\n')
+    assert list(sia.iter_problems(path)) == [
+        ('a', 'x'), ('line-2', 'bare'), ('line-4', 'no id'), ('7', 'numeric id'), ('line-6', 'null id')]
+
+
+def test_iter_problems_skips_bad_rows(sia, tmp_path):
+    path = write(tmp_path / 'p.jsonl',
+                 '{"id": 1, "problem": "a"}\n'
+                 '{"id": 2}\n'
+                 '{not json\n'
+                 '42\n'
+                 '["list"]\n'
+                 '{"id": 3, "problem": "b"}\n')
+    assert list(sia.iter_problems(path)) == [('1', 'a'), ('3', 'b')]
+
+
+def test_iter_problems_csv(sia, tmp_path):
+    path = write(tmp_path / 'p.csv', 'id,problem\nq,hello\n,world\nr,\n')
+    assert list(sia.iter_problems(path)) == [('q', 'hello'), ('row-2', 'world')]
+
+
+def test_iter_problems_csv_without_problem_column(sia, tmp_path):
+    path = write(tmp_path / 'p.csv', 'id,question\nq,hello\n')
+    with pytest.raises(ValueError):
+        list(sia.iter_problems(path))
+
+
+def test_load_completed_ids_skips_partial_last_line(sia, tmp_path):
+    path = write(tmp_path / 'out.jsonl', '{"id": "a"}\n{"id": 2}\n{"id": "c", "sol')
+    assert sia.load_completed_ids(path) == {'a', '2'}
+    assert sia.load_completed_ids(str(tmp_path / 'missing.jsonl')) == set()
+
+
+def test_load_completed_ids_leaves_out_errors(sia, tmp_path):
+    path = write(tmp_path / 'out.jsonl', '{"id": "a"}\n{"id": "b", "error": "quota exceeded"}\n')
+    assert sia.load_completed_ids(path) == {'a'}
+
+
+def test_run_batch_resumes_after_partial_last_line(sia, fake_genai, tmp_path):
+    problems = write(tmp_path / 'p.jsonl', '{"id": "a", "problem": "x"}\n{"id": "b", "problem": "y"}\n')
+    output = write(tmp_path / 'out.jsonl', '{"id": "a", "solution": "done"}\n{"id": "b", "sol')
+
+    assert sia.SelfImprovingAgent('key').run_batch(problems, output) == 1
+    assert [r['id'] for r in read_results(output)] == ['a', 'b']
+
+
+def test_run_batch_retries_errors_on_resume(sia, fake_genai, tmp_path):
+    problems = write(tmp_path / 'p.jsonl', '{"id": "a", "problem": "x"}\n')
+    output = str(tmp_path / 'out.jsonl')
+    agent = sia.SelfImprovingAgent('key')
+
+    fake_genai.GenerativeModel.fail = True
+    agent.run_batch(problems, output)
+    fake_genai.GenerativeModel.fail = False
+    assert agent.run_batch(problems, output) == 1
+    assert ['error' in r for r in read_results(output)] == [True, False]
+    assert agent.run_batch(problems, output) == 0
+
+
+def test_memory_window_must_be_positive(sia, fake_genai, tmp_path):
+    problems = write(tmp_path / 'p.jsonl', '"x"\n')
+    with pytest.raises(ValueError):
+        sia.SelfImprovingAgent('key').run_batch(problems, str(tmp_path / 'out.jsonl'), memory_window=0)
+    with pytest.raises(SystemExit):
+        sia.parse_args(['--memory-window', '0'])
+
+
+def test_run_batch_resume_and_no_resume(sia, fake_genai, tmp_path):
+    problems = write(tmp_path / 'p.jsonl', '{"id": "a", "problem": "x"}\n{"id": "b", "problem": "y"}\n')
+    output = str(tmp_path / 'out.jsonl')
+    agent = sia.SelfImprovingAgent('key')
+
+    assert agent.run_batch(problems, output, concurrency=2) == 2
+    assert agent.run_batch(problems, output, concurrency=2) == 0
+    assert sorted(r['id'] for r in read_results(output)) == ['a', 'b']
+
+    assert agent.run_batch(problems, output, concurrency=2, resume=False) == 2
+    assert len(read_results(output)) == 2
+
+
+def test_run_batch_writes_results_before_bad_row(sia, fake_genai, tmp_path, monkeypatch):
+    problems = write(tmp_path / 'p.jsonl', '{"id": 1, "problem": "a"}\n{"id": 2, "problem": "b"}\n')
+    output = str(tmp_path / 'out.jsonl')
+    real_iter = sia.iter_problems
+
+    def failing_iter(path):
+        for item in real_iter(path):
+            yield item
+        raise OSError("input went away")
+
+    monkeypatch.setattr(sia, 'iter_problems', failing_iter)
+    with pytest.raises(OSError):
+        sia.SelfImprovingAgent('key').run_batch(problems, output, concurrency=4)
+    assert sorted(r['id'] for r in read_results(output)) == ['1', '2']
+
+
+def test_run_batch_iterations_unique_and_stats_survive_trim(sia, fake_genai, tmp_path):
+    problems = write(tmp_path / 'p.jsonl',
+                     ''.join(json.dumps({'id': i, 'problem': f'p{i}'}) + '\n' for i in range(100)))
+    output = str(tmp_path / 'out.jsonl')
+    agent = sia.SelfImprovingAgent('key')
+    agent.run_batch(problems, output, concurrency=8, memory_window=5)
+
+    iterations = [r['iteration'] for r in read_results(output)]
+    assert sorted(iterations) == list(range(1, 101))
+    assert len(agent.memory['successful_strategies']) == 5
+    assert agent.stats['successes'] == 100
+    assert 'Success Rate: 100.0%' in agent.get_performance_report()